@@ -1,23 +1,70 @@
 import os
+import sys
+import asyncio
+import functools
+import string
+import orjson
 from dotenv import load_dotenv
-from webscraper import Website
-from client_open_ai import OpenAIClient
-from client_ollama import OllamaClient
-from client_anthropic import AnthropicClient
-from llm_client import LLMClient
-import json
+from webscraper import Website, fetch_all
+from llm_client import LLMClient, CLIENT_TYPES, run_sync
 from pathlib import Path
+from typing import List, Tuple
 from urllib.parse import urlparse
-import markdown  # Add this to the imports at the top
 
 
 load_dotenv()  # This loads the environment variables from the .env file.
 
+# Characters of text taken from each subpage before it is summarized
+SUBPAGE_MAX_CHARS = 1000
+
+# Most subpages summarized per brochure, and digest calls in flight at once
+MAX_SUBPAGES = 20
+DIGEST_CONCURRENCY = 4
+
+# Write buffer for output files, large enough that a brochure is written with one syscall
+OUTPUT_BUFFER_SIZE = 64 * 1024
+
+_HTML_TEMPLATE = string.Template((Path(__file__).parent / "brochure.html.tmpl").read_text(encoding="utf-8"))
+
+class _PrecompiledTemplate:
+    """
+    A str.format-style prompt template split into literal chunks once at load time.
+    Formatting is then a single join, without re-parsing the template on every call.
+    Only plain {field} placeholders are supported.
+    """
+    
+    def __init__(self, template: str):
+        self.template = template
+        self._parts = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(template):
+            if format_spec or conversion:
+                raise ValueError(f"Unsupported placeholder in prompt template: {{{field}}}")
+            self._parts.append((literal, field))
+    
+    def format(self, **fields: str) -> str:
+        """Fill in the placeholders, mirroring str.format."""
+        parts = []
+        for literal, field in self._parts:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(fields[field]))
+        return "".join(parts)
+
+@functools.cache
+def _markdown_renderer():
+    """
+    Return a shared Markdown converter, built on first use.
+    Markdown sets up its extension pipeline on construction, and the import is
+    deferred so it is only paid for when a brochure is rendered.
+    """
+    import markdown
+    return markdown.Markdown()
+
+@functools.cache
 def load_use_cases() -> dict:
-    """Load use cases from JSON file and attach handler functions."""
+    """Load use cases from JSON file and attach handler functions. Parsed once per process."""
     json_path = Path(__file__).parent / 'use_cases.json'
-    with open(json_path) as f:
-        use_cases = json.load(f)
+    use_cases = orjson.loads(json_path.read_bytes())
     
     # Map handler strings to actual function references
     handler_map = {
@@ -27,8 +74,12 @@ def load_use_cases() -> dict:
     }
     
     # Replace handler strings with actual function references
+    # and compile prompt templates once
     for use_case in use_cases.values():
         use_case['handler'] = handler_map[use_case['handler']]
+        for key in use_case:
+            if key.endswith('_prompt_template'):
+                use_case[key] = _PrecompiledTemplate(use_case[key])
     
     return use_cases
 
@@ -59,6 +110,73 @@ def website_summarizer(url: str, client: LLMClient, model: str) -> str:
     except Exception as e:
         raise Exception(f"Error in summarization: {str(e)}")
 
+async def _summarize_page(client: LLMClient, model: str, page: Website, limit: asyncio.Semaphore) -> str:
+    """
+    Condense a subpage into a short digest for the brochure prompt.
+    
+    Args:
+        client (LLMClient): The initialized LLM client to use
+        model (str): The model to use for generation
+        page (Website): The parsed subpage
+        limit (asyncio.Semaphore): Bounds how many digest calls run at once
+        
+    Returns:
+        str: The page digest
+    """
+    use_case = USE_CASES["company_brochure"]
+    user_prompt = use_case["digest_prompt_template"].format(
+        url=page.url,
+        title=page.title,
+        text=page.text
+    )
+    async with limit:
+        return await client.aget_completion(use_case["digest_system_prompt"], user_prompt, model=model, temperature=0)
+
+async def _gather_subpages(links: List[str], client: LLMClient, model: str) -> List[Tuple[Website, str]]:
+    """
+    Fetch, parse and summarize subpages, running the network and LLM calls concurrently.
+    Only the first MAX_SUBPAGES links are used, with at most DIGEST_CONCURRENCY digest calls
+    in flight. Pages that fail at any step are skipped and counted in the output.
+    
+    Args:
+        links (List[str]): The subpage URLs
+        client (LLMClient): The initialized LLM client to use
+        model (str): The model to use for generation
+        
+    Returns:
+        List[Tuple[Website, str]]: Each parsed subpage with its digest
+    """
+    if len(links) > MAX_SUBPAGES:
+        print(f"Summarizing the first {MAX_SUBPAGES} of {len(links)} internal pages")
+        links = links[:MAX_SUBPAGES]
+    
+    subpages = await fetch_all(links, max_chars=SUBPAGE_MAX_CHARS)
+    if len(subpages) < len(links):
+        print(f"Could not fetch {len(links) - len(subpages)} of {len(links)} internal pages")
+    
+    limit = asyncio.Semaphore(DIGEST_CONCURRENCY)
+    try:
+        digests = await asyncio.gather(
+            *(_summarize_page(client, model, page, limit) for page in subpages),
+            return_exceptions=True
+        )
+    finally:
+        await client.aclose()
+    
+    failures = [digest for digest in digests if isinstance(digest, Exception)]
+    if failures:
+        print(f"Could not summarize {len(failures)} of {len(subpages)} internal pages "
+              f"(first error: {failures[0]})")
+    return [
+        (page, digest) for page, digest in zip(subpages, digests)
+        if not isinstance(digest, Exception)
+    ]
+
+def _site_host(url: str) -> str:
+    """Return the host of a URL, lowercased and without a leading 'www.', for same-site checks."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
 def company_brochure(url: str, client: LLMClient, model: str) -> str:
     """
     Fetches content from a company website and its relevant subpages to generate a professional brochure.
@@ -79,21 +197,26 @@ def company_brochure(url: str, client: LLMClient, model: str) -> str:
         # Fetch main website content
         main_site = Website(url)
         
-        # Gather content from all available links
-        additional_content = []
+        # Only follow each same-site link once; off-site pages don't describe the company.
+        # main_site.url is the address after redirects, e.g. example.com -> www.example.com
+        site = _site_host(main_site.url)
+        home = main_site.url.rstrip('/')
+        links = [
+            link for link in dict.fromkeys(main_site.links)
+            if link.rstrip('/') != home and _site_host(link) == site
+        ]
+        
+        # Gather short digests of all available links, fetched and summarized concurrently
         print("\nGathering content from internal pages...")
-        for link in main_site.links:
-            try:
-                subpage = Website(link)
-                additional_content.append(
-                    f"\n=== PAGE ===\n"
-                    f"URL: {link}\n"
-                    f"Title: {subpage.title}\n"
-                    f"Content:\n{subpage.text[:1000]}\n"
-                    f"============="
-                )
-            except Exception:
-                continue
+        subpages = run_sync(_gather_subpages(links, client, model))
+        additional_content = [
+            f"\n=== PAGE ===\n"
+            f"URL: {subpage.url}\n"
+            f"Title: {subpage.title}\n"
+            f"Digest:\n{digest}\n"
+            f"============="
+            for subpage, digest in subpages
+        ]
     
         # Combine all content with clear URL sections
         combined_content = (
@@ -102,7 +225,7 @@ def company_brochure(url: str, client: LLMClient, model: str) -> str:
             f"Title: {main_site.title}\n"
             f"Content:\n{main_site.text}\n"
             f"===============\n"
-            f"\n=== SUBPAGES ===\n"
+            f"\n=== SUBPAGE DIGESTS ===\n"
             f"{''.join(additional_content)}"
         )
         
@@ -112,14 +235,10 @@ def company_brochure(url: str, client: LLMClient, model: str) -> str:
         print(f"URL: {main_site.url}")
         print(f"Characters extracted: {len(main_site.text)}")
         
-        for link in main_site.links:
-            try:
-                subpage = Website(link)
-                print(f"\nTitle: {subpage.title}")
-                print(f"URL: {link}")
-                print(f"Characters extracted: {len(subpage.text)}")
-            except Exception:
-                continue
+        for subpage, _ in subpages:
+            print(f"\nTitle: {subpage.title}")
+            print(f"URL: {subpage.url}")
+            print(f"Characters extracted: {len(subpage.text)}")
                 
         use_case = USE_CASES["company_brochure"]
         user_prompt = use_case["user_prompt_template"].format(
@@ -127,7 +246,6 @@ def company_brochure(url: str, client: LLMClient, model: str) -> str:
             title=main_site.title,
             text=combined_content
         )
-        result = client.get_completion(use_case["system_prompt"], user_prompt, model=model)
         
         # Create output directory if it doesn't exist
         output_dir = Path("output")
@@ -137,36 +255,23 @@ def company_brochure(url: str, client: LLMClient, model: str) -> str:
         domain = urlparse(url).netloc
         safe_filename = domain.replace(".", "_")
         
-        # Save markdown file
+        # Stream the brochure to the console and the markdown file as it is generated
+        print("\nBrochure:\n")
+        chunks = []
         md_path = output_dir / f"{safe_filename}_brochure.md"
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write(result)
+        with open(md_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
+            for chunk in client.get_completion_stream(use_case["system_prompt"], user_prompt, model=model):
+                chunks.append(chunk)
+                f.write(chunk)
+                sys.stdout.write(chunk)
+                sys.stdout.flush()
+        print()
+        result = "".join(chunks)
         
         # Convert to HTML and save
-        html_content = markdown.markdown(result)
+        html_content = _markdown_renderer().reset().convert(result)
         html_path = output_dir / f"{safe_filename}_brochure.html"
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>Company Brochure - {domain}</title>
-    <style>
-        body {{
-            max-width: 800px;
-            margin: 40px auto;
-            padding: 0 20px;
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-        }}
-    </style>
-</head>
-<body>
-    {html_content}
-</body>
-</html>
-""")
+        html_path.write_text(_HTML_TEMPLATE.substitute(domain=domain, content=html_content), encoding="utf-8")
         
         print(f"\nFiles saved:")
         print(f"Markdown: {md_path}")
@@ -221,7 +326,7 @@ if __name__ == "__main__":
     input_value = input(use_case["input_prompt"])
     
     # Display available clients
-    clients = ["openai", "ollama", "anthropic"]
+    clients = list(CLIENT_TYPES)
     print("\nSelect the LLM client to use:")
     for i, client in enumerate(clients, 1):
         print(f"{i}. {client}")
@@ -230,15 +335,8 @@ if __name__ == "__main__":
     client_type = clients[int(choice) - 1] if choice.isdigit() and 1 <= int(choice) <= len(clients) else "openai"
     
     try:
-        # Initialize AI client and get available models
-        if client_type.lower() == "openai":
-            client = OpenAIClient()
-        elif client_type.lower() == "ollama":
-            client = OllamaClient()
-        elif client_type.lower() == "anthropic":
-            client = AnthropicClient()
-        else:
-            raise ValueError(f"Unsupported client type: {client_type}")
+        # Initialize AI client (only the selected provider's SDK is imported)
+        client = LLMClient.create(client_type)
         
         # Get and display available models
         print(f"\nFetching available models for {client_type}...")
@@ -257,8 +355,10 @@ if __name__ == "__main__":
         print("\nProcessing...")
         # Call the handler function for the selected use case
         result = use_case["handler"](input_value, client, model)
-        print(f"\nResults for {use_case['name']}:")
-        print("-" * (20 + len(use_case['name'])))
-        print(result)
+        # Streaming use cases have already printed their output
+        if not use_case.get("streams_output"):
+            print(f"\nResults for {use_case['name']}:")
+            print("-" * (20 + len(use_case['name'])))
+            print(result)
     except Exception as e:
         print(f"\nError: {str(e)}")
\ No newline at end of file
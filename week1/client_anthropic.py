@@ -1,36 +1,50 @@
 import anthropic
+import asyncio
 import os
-from typing import List
-from llm_client import LLMClient
+from typing import List, Dict, Any, Iterator
+from llm_client import LLMClient, is_transient_status, retry_transient
+from llm_cache import LLMCache, cached_completion, default_cache
+
+def _is_transient(error: BaseException) -> bool:
+    """Dropped connections/timeouts, rate limits, overload (529) and other 5xx responses are worth retrying."""
+    if isinstance(error, anthropic.APIConnectionError):
+        return True
+    return isinstance(error, anthropic.APIStatusError) and is_transient_status(error.status_code)
 
 class AnthropicClient(LLMClient):
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, cache: LLMCache = None):
         """
         Initialize Anthropic client.
         
         Args:
             api_key (str, optional): Anthropic API key. If not provided, will look for ANTHROPIC_API_KEY env var.
+            cache (LLMCache, optional): Response cache. Defaults to the shared on-disk cache.
         """
         self.api_key = api_key or os.getenv('ANTHROPIC_API_KEY')
-        if not self.api_key:
-            raise ValueError("No API key provided. Set ANTHROPIC_API_KEY environment variable or pass key to constructor.")
+        self._validate_connection()
             
         self.client = anthropic.Anthropic(api_key=self.api_key)
-        self._validate_connection()
+        # Message calls are retried by retry_transient, so they skip the SDK's own retries;
+        # streaming and model listing keep them
+        self._message_client = self.client.with_options(max_retries=0)
+        self.cache = cache if cache is not None else default_cache()
+        self._async_client = None
+        self._async_loop = None
     
     def _validate_connection(self) -> None:
         """
-        Validate connection to Anthropic API.
+        Validate that an API key is available.
+        
+        Connectivity is not checked here to avoid a network round-trip on startup;
+        connection problems surface on the first API call.
         
         Raises:
-            ConnectionError: If cannot connect to Anthropic API
+            ValueError: If no API key is provided
         """
-        try:
-            # Simple validation by listing models
-            self.client.models.list()
-        except Exception as e:
-            raise ConnectionError(f"Cannot connect to Anthropic API: {str(e)}")
+        if not self.api_key:
+            raise ValueError("No API key provided. Set ANTHROPIC_API_KEY environment variable or pass key to constructor.")
     
+    @cached_completion
     def get_completion(self, 
                       system_prompt: str,
                       user_prompt: str,
@@ -48,18 +62,42 @@ class AnthropicClient(LLMClient):
         Returns:
             str: The generated completion text
             
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        return self.get_chat(system_prompt, [{"role": "user", "content": user_prompt}], model, temperature)
+    
+    def get_chat(self,
+                 system_prompt: str,
+                 messages: List[Dict[str, str]],
+                 model: str,
+                 temperature: float = 0.7) -> str:
+        """
+        Get the next assistant message for a multi-turn chat from Anthropic API.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            messages (List[Dict[str, str]]): Prior turns as {"role": "user" | "assistant", "content": ...}
+            model (str): Model to use (e.g., "claude-3-opus-20240229")
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Returns:
+            str: The generated message text
+            
         Raises:
             Exception: If there's an error in API communication
         """
         try:
-            message = self.client.messages.create(
+            message = self._create_message(
                 model=model,
                 max_tokens=1000,
-                system=system_prompt,
-                messages=[{
-                    "role": "user",
-                    "content": user_prompt
+                # Mark the static system prompt as cacheable so repeat calls reuse the prefix
+                system=[{
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"}
                 }],
+                messages=self._mark_history_cacheable(messages),
                 temperature=temperature
             )
             return message.content[0].text
@@ -67,6 +105,145 @@ class AnthropicClient(LLMClient):
         except Exception as e:
             raise Exception(f"Error getting completion from Anthropic: {str(e)}")
     
+    @retry_transient(_is_transient)
+    def _create_message(self, **kwargs) -> Any:
+        """Create a message, retrying transient failures."""
+        return self._message_client.messages.create(**kwargs)
+    
+    @retry_transient(_is_transient)
+    async def _acreate_message(self, **kwargs) -> Any:
+        """Create a message on the async client, retrying transient failures."""
+        return await self._get_async_client().messages.create(**kwargs)
+    
+    @staticmethod
+    def _mark_history_cacheable(messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Mark the end of a multi-turn history as a cache breakpoint.
+        
+        The next turn of the same chat starts with this exact prefix, so Anthropic can
+        reuse it instead of reprocessing the whole history. Single-message requests are
+        returned unchanged since there is no history to share.
+        """
+        if len(messages) < 2 or not isinstance(messages[-1]["content"], str):
+            return messages
+        last = messages[-1]
+        return [*messages[:-1], {
+            "role": last["role"],
+            "content": [{
+                "type": "text",
+                "text": last["content"],
+                "cache_control": {"type": "ephemeral"}
+            }]
+        }]
+    
+    def _get_async_client(self) -> anthropic.AsyncAnthropic:
+        """Return an AsyncAnthropic client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=0)
+            self._async_loop = loop
+        return self._async_client
+    
+    @cached_completion
+    async def aget_completion(self,
+                              system_prompt: str,
+                              user_prompt: str,
+                              model: str,
+                              temperature: float = 0.7) -> str:
+        """
+        Get completion from Anthropic API without blocking the event loop.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            user_prompt (str): The user prompt for completion
+            model (str): Model to use (e.g., "claude-3-opus-20240229")
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Returns:
+            str: The generated completion text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        return await self.aget_chat(system_prompt, [{"role": "user", "content": user_prompt}], model, temperature)
+    
+    async def aget_chat(self,
+                        system_prompt: str,
+                        messages: List[Dict[str, str]],
+                        model: str,
+                        temperature: float = 0.7) -> str:
+        """
+        Get the next assistant message for a multi-turn chat from Anthropic API without blocking the event loop.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            messages (List[Dict[str, str]]): Prior turns as {"role": "user" | "assistant", "content": ...}
+            model (str): Model to use (e.g., "claude-3-opus-20240229")
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Returns:
+            str: The generated message text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        try:
+            message = await self._acreate_message(
+                model=model,
+                max_tokens=1000,
+                system=[{
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"}
+                }],
+                messages=self._mark_history_cacheable(messages),
+                temperature=temperature
+            )
+            return message.content[0].text
+            
+        except Exception as e:
+            raise Exception(f"Error getting completion from Anthropic: {str(e)}")
+    
+    def get_completion_stream(self,
+                              system_prompt: str,
+                              user_prompt: str,
+                              model: str,
+                              temperature: float = 0.7) -> Iterator[str]:
+        """
+        Stream a completion from Anthropic API as it is generated.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            user_prompt (str): The user prompt for completion
+            model (str): Model to use (e.g., "claude-3-opus-20240229")
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Yields:
+            str: Successive chunks of the generated completion text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        try:
+            with self.client.messages.stream(
+                model=model,
+                max_tokens=1000,
+                system=[{
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"}
+                }],
+                messages=[{
+                    "role": "user",
+                    "content": user_prompt
+                }],
+                temperature=temperature
+            ) as stream:
+                yield from stream.text_stream
+                
+        except Exception as e:
+            raise Exception(f"Error streaming completion from Anthropic: {str(e)}")
+    
     def list_models(self) -> List[str]:
         """
         Get list of available models from Anthropic.
@@ -77,6 +254,10 @@ class AnthropicClient(LLMClient):
         Raises:
             Exception: If there's an error in API communication
         """
+        return self._cached_models("anthropic", self._fetch_models)
+    
+    def _fetch_models(self) -> List[str]:
+        """Fetch the model list from the Anthropic API."""
         try:
             models = self.client.models.list()
             return [model.id for model in models.data]
@@ -1,16 +1,45 @@
+import asyncio
+import aiohttp
+import orjson
 import requests
-from typing import List, Dict, Any
-from llm_client import LLMClient
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Iterator, Set
+from llm_client import LLMClient, retry_transient
+from llm_cache import LLMCache, cached_completion, default_cache
+
+# Models already checked or pulled in this process, per server base URL,
+# shared by all clients so new instances skip the availability check
+_VERIFIED_MODELS: Dict[str, Set[str]] = {}
+
+# Connection failures (e.g. the server still starting) are worth retrying
+_TRANSIENT_ERRORS = (requests.ConnectionError,)
+_ASYNC_TRANSIENT_ERRORS = (aiohttp.ClientConnectionError,)
+
+# Generation on a local model can legitimately take minutes, so only connecting is timed,
+# matching the synchronous session
+_ASYNC_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=10)
 
 class OllamaClient(LLMClient):
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    def __init__(self, base_url: str = "http://localhost:11434", cache: LLMCache = None):
         """
         Initialize Ollama client.
         
         Args:
             base_url (str, optional): Ollama API base URL. Defaults to local instance.
+            cache (LLMCache, optional): Response cache. Defaults to the shared on-disk cache.
         """
         self.base_url = base_url.rstrip('/')
+        self.cache = cache if cache is not None else default_cache()
+        
+        # Reuse one connection pool for all requests to the server
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        
+        # Models known to be available locally, filled in by _validate_connection
+        self._available_models: Set[str] = set()
+        self._verified_models = _VERIFIED_MODELS.setdefault(self.base_url, set())
+        self._async_session = None
+        self._async_loop = None
         self._validate_connection()
     
     def _validate_connection(self) -> None:
@@ -21,11 +50,23 @@ class OllamaClient(LLMClient):
             ConnectionError: If cannot connect to Ollama server
         """
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
-            response.raise_for_status()
+            self._fetch_local_models()
         except requests.RequestException as e:
             raise ConnectionError(f"Cannot connect to Ollama server: {str(e)}")
     
+    def _fetch_local_models(self) -> List[str]:
+        """
+        Fetch the locally available models and refresh the known-model set.
+        
+        Returns:
+            List[str]: Names of the locally available models
+        """
+        response = self.session.get(f"{self.base_url}/api/tags")
+        response.raise_for_status()
+        models = [tag['name'] for tag in orjson.loads(response.content)['models']]
+        self._available_models = set(models)
+        return models
+    
     def _ensure_model(self, model: str) -> None:
         """
         Ensure the requested model is available, pull if not.
@@ -36,23 +77,24 @@ class OllamaClient(LLMClient):
         try:
             # Extract just the model name if it includes size info
             model_name = model.split(" (")[0]
+            if model_name in self._verified_models:
+                return
             
-            # Check if model exists
-            response = requests.get(f"{self.base_url}/api/tags")
-            response.raise_for_status()
-            models = [tag['name'] for tag in response.json()['models']]
-            
-            if model_name not in models:
+            # Not known yet; the model may have been pulled since the last check
+            if model_name not in self._available_models and model_name not in self._fetch_local_models():
                 print(f"Model {model_name} not found locally. Pulling from repository...")
-                pull_response = requests.post(
+                pull_response = self.session.post(
                     f"{self.base_url}/api/pull",
                     json={"name": model_name}
                 )
                 pull_response.raise_for_status()
                 print(f"Successfully pulled {model_name}")
+                self._available_models.add(model_name)
+            self._verified_models.add(model_name)
         except requests.RequestException as e:
             raise Exception(f"Error ensuring model availability: {str(e)}")
     
+    @cached_completion
     def get_completion(self, 
                       system_prompt: str,
                       user_prompt: str,
@@ -84,24 +126,198 @@ class OllamaClient(LLMClient):
             payload = {
                 "model": model,
                 "prompt": combined_prompt,
-                "temperature": temperature,
+                "options": {"temperature": temperature},
                 "stream": False
             }
             
-            # Make the request to Ollama
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload
-            )
-            response.raise_for_status()
+            # Make the request to Ollama and extract the response
+            result = self._post("/api/generate", payload)
+            return result['response']
+            
+        except requests.RequestException as e:
+            raise Exception(f"Error getting completion from Ollama: {str(e)}")
+    
+    @cached_completion
+    async def aget_completion(self,
+                              system_prompt: str,
+                              user_prompt: str,
+                              model: str,
+                              temperature: float = 0.7) -> str:
+        """
+        Get completion from Ollama API without blocking the event loop.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            user_prompt (str): The user prompt for completion
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
             
-            # Extract the response
-            result = response.json()
+        Returns:
+            str: The generated completion text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        try:
+            await asyncio.to_thread(self._ensure_model, model)
+            
+            payload = {
+                "model": model,
+                "prompt": f"{system_prompt}\n\n{user_prompt}",
+                "options": {"temperature": temperature},
+                "stream": False
+            }
+            
+            result = await self._apost("/api/generate", payload)
             return result['response']
             
+        except aiohttp.ClientError as e:
+            raise Exception(f"Error getting completion from Ollama: {str(e)}")
+    
+    def get_chat(self,
+                 system_prompt: str,
+                 messages: List[Dict[str, str]],
+                 model: str,
+                 temperature: float = 0.7) -> str:
+        """
+        Get the next assistant message for a multi-turn chat from Ollama API.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            messages (List[Dict[str, str]]): Prior turns as {"role": "user" | "assistant", "content": ...}
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Returns:
+            str: The generated message text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        try:
+            self._ensure_model(model)
+            
+            result = self._post("/api/chat", self._chat_payload(system_prompt, messages, model, temperature))
+            return result['message']['content']
+            
         except requests.RequestException as e:
             raise Exception(f"Error getting completion from Ollama: {str(e)}")
     
+    async def aget_chat(self,
+                        system_prompt: str,
+                        messages: List[Dict[str, str]],
+                        model: str,
+                        temperature: float = 0.7) -> str:
+        """
+        Get the next assistant message for a multi-turn chat from Ollama API without blocking the event loop.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            messages (List[Dict[str, str]]): Prior turns as {"role": "user" | "assistant", "content": ...}
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Returns:
+            str: The generated message text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        try:
+            await asyncio.to_thread(self._ensure_model, model)
+            
+            result = await self._apost("/api/chat", self._chat_payload(system_prompt, messages, model, temperature))
+            return result['message']['content']
+            
+        except aiohttp.ClientError as e:
+            raise Exception(f"Error getting completion from Ollama: {str(e)}")
+    
+    @retry_transient(_TRANSIENT_ERRORS)
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a non-streaming request to the Ollama API, retrying transient failures."""
+        response = self.session.post(f"{self.base_url}{path}", json=payload)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    @retry_transient(_ASYNC_TRANSIENT_ERRORS)
+    async def _apost(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a non-streaming request to the Ollama API without blocking, retrying transient failures."""
+        async with self._get_async_session().post(f"{self.base_url}{path}", json=payload) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())
+    
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """Return an aiohttp session bound to the running event loop, reusing its connections."""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_session = aiohttp.ClientSession(timeout=_ASYNC_TIMEOUT)
+            self._async_loop = loop
+        return self._async_session
+    
+    async def aclose(self) -> None:
+        """Close the aiohttp session opened on the running event loop, if any."""
+        if self._async_session is not None and self._async_loop is asyncio.get_running_loop():
+            await self._async_session.close()
+            self._async_session = None
+            self._async_loop = None
+    
+    def _chat_payload(self,
+                      system_prompt: str,
+                      messages: List[Dict[str, str]],
+                      model: str,
+                      temperature: float) -> Dict[str, Any]:
+        """Build the /api/chat request body."""
+        return {
+            "model": model,
+            "messages": [{"role": "system", "content": system_prompt}, *messages],
+            "options": {"temperature": temperature},
+            "stream": False
+        }
+    
+    def get_completion_stream(self,
+                              system_prompt: str,
+                              user_prompt: str,
+                              model: str,
+                              temperature: float = 0.7) -> Iterator[str]:
+        """
+        Stream a completion from Ollama API as it is generated.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            user_prompt (str): The user prompt for completion
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Yields:
+            str: Successive chunks of the generated completion text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        try:
+            self._ensure_model(model)
+            
+            payload = {
+                "model": model,
+                "prompt": f"{system_prompt}\n\n{user_prompt}",
+                "options": {"temperature": temperature},
+                "stream": True
+            }
+            
+            # Ollama streams one JSON object per line
+            with self.session.post(f"{self.base_url}/api/generate", json=payload, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = orjson.loads(line)
+                    yield chunk.get('response', "")
+                    if chunk.get('done'):
+                        break
+                        
+        except requests.RequestException as e:
+            raise Exception(f"Error streaming completion from Ollama: {str(e)}")
+    
     def list_models(self) -> List[str]:
         """
         Get list of available models from Ollama.
@@ -113,8 +329,6 @@ class OllamaClient(LLMClient):
             Exception: If there's an error in API communication
         """
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
-            response.raise_for_status()
-            return [tag['name'] for tag in response.json()['models']]
+            return self._fetch_local_models()
         except requests.RequestException as e:
             raise Exception(f"Failed to fetch Ollama models: {str(e)}") 
\ No newline at end of file
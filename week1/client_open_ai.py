@@ -1,19 +1,40 @@
+import asyncio
+import hashlib
 import os
-from openai import OpenAI
-from typing import List, Dict, Any
-from llm_client import LLMClient
+import re
+import openai
+from openai import OpenAI, AsyncOpenAI
+from typing import List, Dict, Any, Iterator
+from llm_client import LLMClient, is_transient_status, retry_transient
+from llm_cache import LLMCache, cached_completion, default_cache
+
+# OpenAI keys start with "sk-" and contain no whitespace
+_API_KEY_RE = re.compile(r"sk-\S+")
+
+def _is_transient(error: BaseException) -> bool:
+    """Dropped connections/timeouts, rate limits and 5xx responses are worth retrying."""
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    return isinstance(error, openai.APIStatusError) and is_transient_status(error.status_code)
 
 class OpenAIClient(LLMClient):
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, cache: LLMCache = None):
         """
         Initialize OpenAI client with API key.
         
         Args:
             api_key (str, optional): OpenAI API key. If None, will try to get from environment.
+            cache (LLMCache, optional): Response cache. Defaults to the shared on-disk cache.
         """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         self._validate_connection()
         self.client = OpenAI(api_key=self.api_key)
+        # Chat calls are retried by retry_transient, so they skip the SDK's own retries;
+        # streaming and model listing keep them
+        self._chat_client = self.client.with_options(max_retries=0)
+        self.cache = cache if cache is not None else default_cache()
+        self._async_client = None
+        self._async_loop = None
     
     def _validate_connection(self) -> None:
         """
@@ -22,13 +43,10 @@ class OpenAIClient(LLMClient):
         Raises:
             ValueError: If API key is invalid
         """
-        if (self.api_key is None or 
-            not self.api_key.strip() or 
-            ' ' in self.api_key or 
-            '\t' in self.api_key or
-            not self.api_key.startswith('sk-')):
+        if not _API_KEY_RE.fullmatch(self.api_key or ""):
             raise ValueError("Invalid API key: Key is either None, empty, contains spaces/tabs, or has invalid format.")
     
+    @cached_completion
     def get_completion(self, 
                       system_prompt: str,
                       user_prompt: str,
@@ -46,22 +64,160 @@ class OpenAIClient(LLMClient):
         Returns:
             str: The generated completion text
             
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        return self.get_chat(system_prompt, [{"role": "user", "content": user_prompt}], model, temperature)
+
+    def get_chat(self,
+                 system_prompt: str,
+                 messages: List[Dict[str, str]],
+                 model: str,
+                 temperature: float = 0.7) -> str:
+        """
+        Get the next assistant message for a multi-turn chat from OpenAI API.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            messages (List[Dict[str, str]]): Prior turns as {"role": "user" | "assistant", "content": ...}
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Returns:
+            str: The generated message text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        try:
+            response = self._create_chat(
+                model=model,
+                messages=[{"role": "system", "content": system_prompt}, *messages],
+                temperature=temperature,
+                extra_body={"prompt_cache_key": self._prompt_cache_key(system_prompt)}
+            )
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            raise Exception(f"Error getting completion from OpenAI: {str(e)}")
+
+    @retry_transient(_is_transient)
+    def _create_chat(self, **kwargs) -> Any:
+        """Create a chat completion, retrying transient failures."""
+        return self._chat_client.chat.completions.create(**kwargs)
+
+    @retry_transient(_is_transient)
+    async def _acreate_chat(self, **kwargs) -> Any:
+        """Create a chat completion on the async client, retrying transient failures."""
+        return await self._get_async_client().chat.completions.create(**kwargs)
+
+    @staticmethod
+    def _prompt_cache_key(system_prompt: str) -> str:
+        """
+        Key requests by system prompt so calls sharing a prefix (e.g. the turns of one
+        debate participant) are routed to the same OpenAI prompt cache.
+        """
+        return hashlib.sha256(system_prompt.encode()).hexdigest()[:32]
+
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Return an AsyncOpenAI client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = AsyncOpenAI(api_key=self.api_key, max_retries=0)
+            self._async_loop = loop
+        return self._async_client
+
+    @cached_completion
+    async def aget_completion(self,
+                              system_prompt: str,
+                              user_prompt: str,
+                              model: str,
+                              temperature: float = 0.7) -> str:
+        """
+        Get completion from OpenAI API without blocking the event loop.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            user_prompt (str): The user prompt for completion
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Returns:
+            str: The generated completion text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        return await self.aget_chat(system_prompt, [{"role": "user", "content": user_prompt}], model, temperature)
+
+    async def aget_chat(self,
+                        system_prompt: str,
+                        messages: List[Dict[str, str]],
+                        model: str,
+                        temperature: float = 0.7) -> str:
+        """
+        Get the next assistant message for a multi-turn chat from OpenAI API without blocking the event loop.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            messages (List[Dict[str, str]]): Prior turns as {"role": "user" | "assistant", "content": ...}
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Returns:
+            str: The generated message text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        try:
+            response = await self._acreate_chat(
+                model=model,
+                messages=[{"role": "system", "content": system_prompt}, *messages],
+                temperature=temperature,
+                extra_body={"prompt_cache_key": self._prompt_cache_key(system_prompt)}
+            )
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            raise Exception(f"Error getting completion from OpenAI: {str(e)}")
+
+    def get_completion_stream(self,
+                              system_prompt: str,
+                              user_prompt: str,
+                              model: str,
+                              temperature: float = 0.7) -> Iterator[str]:
+        """
+        Stream a completion from OpenAI API as it is generated.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            user_prompt (str): The user prompt for completion
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Yields:
+            str: Successive chunks of the generated completion text
+            
         Raises:
             Exception: If there's an error in API communication
         """
         try:
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model=model,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                temperature=temperature
+                temperature=temperature,
+                stream=True
             )
-            return response.choices[0].message.content
-            
+            for chunk in stream:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+                    
         except Exception as e:
-            raise Exception(f"Error getting completion from OpenAI: {str(e)}")
+            raise Exception(f"Error streaming completion from OpenAI: {str(e)}")
 
     def list_models(self) -> List[str]:
         """
@@ -73,6 +229,10 @@ class OpenAIClient(LLMClient):
         Raises:
             Exception: If there's an error in API communication
         """
+        return self._cached_models("openai", self._fetch_models)
+
+    def _fetch_models(self) -> List[str]:
+        """Fetch the chat-capable GPT models from the OpenAI API."""
         try:
             models = self.client.models.list()
             # Filter to only get the GPT models since those are the ones
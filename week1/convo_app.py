@@ -1,15 +1,53 @@
 import os
+import sys
+import asyncio
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from dotenv import load_dotenv
-from typing import List, Dict, Tuple
-import json
+from typing import List, Dict, Tuple, Optional, NamedTuple
+import orjson
 from pathlib import Path
 from client_open_ai import OpenAIClient
 from client_ollama import OllamaClient
 from client_anthropic import AnthropicClient
-from llm_client import LLMClient
+from llm_client import LLMClient, run_sync
 
 load_dotenv()
 
+# Available clients
+CLIENTS = {
+    "1": ("OpenAI", OpenAIClient),
+    "2": ("Ollama", OllamaClient),
+    "3": ("Anthropic", AnthropicClient)
+}
+
+# Connected clients and their model lists, per client class. Set up in background
+# threads so the network calls overlap with the user reading the menu.
+_EXECUTOR = ThreadPoolExecutor(max_workers=len(CLIENTS))
+_CLIENT_FUTURES: Dict[type, "Future[Tuple[LLMClient, List[str]]]"] = {}
+
+def _connect(client_class: type) -> Tuple[LLMClient, List[str]]:
+    """Initialize a client and fetch its available models."""
+    client = client_class()
+    return client, client.list_models()
+
+def _get_client(client_class: type) -> "Future[Tuple[LLMClient, List[str]]]":
+    """Return the (possibly still running) setup for a client class, starting it if needed."""
+    if client_class not in _CLIENT_FUTURES:
+        _CLIENT_FUTURES[client_class] = _EXECUTOR.submit(_connect, client_class)
+    return _CLIENT_FUTURES[client_class]
+
+def prefetch_clients() -> None:
+    """Start setting up every client in the background."""
+    for _, client_class in CLIENTS.values():
+        _get_client(client_class)
+
+class Turn(NamedTuple):
+    """One entry in the debate log."""
+    speaker: str
+    message: str
+
 class ModelConversation:
     def __init__(
         self, 
@@ -24,88 +62,117 @@ class ModelConversation:
         self.initial_prompt = initial_prompt
         self.turns = turns
         self.max_chars = max_chars
-        self.conversation_history: List[Dict[str, str]] = []
+        self.conversation_history: List[Turn] = []
+        # The conversation as chat messages from each participant's point of view:
+        # their own turns are "assistant", everyone else's are "user"
+        self._messages: Tuple[List[Dict[str, str]], List[Dict[str, str]]] = ([], [])
+    
+    def _add_to_history(self, speaker: str, message: str, participant: Optional[int] = None) -> None:
+        """
+        Record a message in the conversation history and in each participant's chat messages.
+        
+        Args:
+            speaker (str): Name shown for the message
+            message (str): The message text
+            participant (int, optional): 0 or 1 if a participant spoke, None for the moderator
+        """
+        self.conversation_history.append(Turn(speaker, message))
+        for index, messages in enumerate(self._messages):
+            if index == participant:
+                messages.append({"role": "assistant", "content": message})
+            else:
+                messages.append({"role": "user", "content": f"{speaker}: {message}"})
+    
+    def _skip_turn(self, speaker: str, participant: int) -> None:
+        """
+        Record that a participant passed their turn.
+        
+        The note goes to the other participant as a user message, so their next request
+        still ends on a user turn instead of their own previous reply.
+        
+        Args:
+            speaker (str): Name of the participant who passed
+            participant (int): 0 or 1, the participant who passed
+        """
+        note = f"{speaker} passed this turn."
+        self.conversation_history.append(Turn("Moderator", note))
+        self._messages[1 - participant].append({"role": "user", "content": f"Moderator: {note}"})
     
-    def _format_conversation_history(self) -> str:
-        """Format the conversation history for prompt injection."""
-        formatted = ""
-        for entry in self.conversation_history:
-            formatted += f"{entry['speaker']}: {entry['message']}\n"
-        return formatted
+    def run_conversation(self) -> List[Turn]:
+        """Run the conversation between the two models; also works where an event loop is already running."""
+        return run_sync(run_many([self]))[0]
     
-    def run_conversation(self) -> List[Dict[str, str]]:
-        """Run the conversation between the two models."""
+    async def run_conversation_async(self) -> List[Turn]:
+        """Run the conversation between the two models without blocking the event loop."""
         # Start with the initial prompt
-        self.conversation_history.append({
-            "speaker": "Moderator",
-            "message": self.initial_prompt
-        })
-        print(f"\nModerator: {self.initial_prompt}")
+        self._add_to_history("Moderator", self.initial_prompt)
+        sys.stdout.write(f"\nModerator: {self.initial_prompt}\n")
+        sys.stdout.flush()
         
         # Alternate between models for the specified number of turns
         for turn in range(self.turns):
             # Determine current model
-            current_model = self.model1 if turn % 2 == 0 else self.model2
+            participant = turn % 2
+            current_model = self.model1 if participant == 0 else self.model2
             speaker = current_model[3]  # Use character name
             
-            # Create prompt with conversation history
-            conversation_text = self._format_conversation_history()
-            user_prompt = (
-                f"Here's the conversation so far:\n{conversation_text}\n"
-                f"Please provide your response. Keep it under {self.max_chars} characters:"
-            )
-            
-            # Get response from current model
+            # Get response from current model, sending the conversation as chat messages
             try:
-                response = current_model[0].get_completion(
-                    system_prompt=current_model[2],
-                    user_prompt=user_prompt,
+                response = await current_model[0].aget_chat(
+                    system_prompt=f"{current_model[2]}\n\nKeep each response under {self.max_chars} characters.",
+                    messages=self._messages[participant],
                     model=current_model[1]
                 )
                 
-                # Truncate response if it exceeds max_chars
-                if len(response) > self.max_chars:
-                    response = response[:self.max_chars] + "..."
+                # Cap the response at max_chars once; the capped text is stored and printed
+                capped = response if len(response) <= self.max_chars else f"{response[:self.max_chars]}..."
                 
                 # Add response to history
-                self.conversation_history.append({
-                    "speaker": speaker,
-                    "message": response
-                })
+                self._add_to_history(speaker, capped, participant)
                 
-                # Print real-time updates (simplified format)
-                print(f"\n{speaker}: {response}")
+                # Print real-time updates (simplified format), one write and flush per turn
+                sys.stdout.write(f"\n{speaker}: {capped}\n")
+                sys.stdout.flush()
                 
             except Exception as e:
-                print(f"\nError getting response from {speaker}: {str(e)}")
-                break
+                # Transient errors were already retried by the client; skip this turn
+                # and keep the debate going so the turns so far are still saved
+                self._skip_turn(speaker, participant)
+                sys.stdout.write(f"\nError getting response from {speaker}, skipping turn: {str(e)}\n")
+                sys.stdout.flush()
+                continue
         
         return self.conversation_history
 
+async def run_many(conversations: List[ModelConversation]) -> List[List[Turn]]:
+    """
+    Run several independent conversations concurrently.
+    Turns within each conversation stay sequential; the network waits overlap across conversations.
+    """
+    try:
+        return await asyncio.gather(*(conversation.run_conversation_async() for conversation in conversations))
+    finally:
+        # Release per-loop resources such as HTTP sessions, once per distinct client
+        clients = {id(model[0]): model[0] for conversation in conversations
+                   for model in (conversation.model1, conversation.model2)}
+        for client in clients.values():
+            await client.aclose()
+
 def select_client_and_model() -> Tuple[LLMClient, str]:
     """Helper function to select a client and model."""
-    # Available clients
-    clients = {
-        "1": ("OpenAI", OpenAIClient),
-        "2": ("Ollama", OllamaClient),
-        "3": ("Anthropic", AnthropicClient)
-    }
-    
     # Display client options
     print("\nSelect client:")
-    for key, (name, _) in clients.items():
+    for key, (name, _) in CLIENTS.items():
         print(f"{key}. {name}")
     
     # Get client selection
     client_choice = input("Enter choice (1-3): ").strip()
-    client_name, client_class = clients.get(client_choice, clients["1"])
+    client_name, client_class = CLIENTS.get(client_choice, CLIENTS["1"])
     
     try:
-        # Initialize client
-        client = client_class()
-        
-        # Get available models
-        available_models = client.list_models()
+        # Initialize client and get available models; usually already done in the
+        # background, and shared if this provider was already picked
+        client, available_models = _get_client(client_class).result()
         
         # Display model options
         print(f"\nAvailable {client_name} models:")
@@ -125,6 +192,7 @@ def select_client_and_model() -> Tuple[LLMClient, str]:
 def main():
     print("\n=== AI Debate Simulator ===")
     print("Create a debate between two AI models with unique personalities!")
+    prefetch_clients()
     
     # Select first model
     print("\n--- First Participant Setup ---")
@@ -192,26 +260,27 @@ def main():
     output_dir = Path("output")
     output_dir.mkdir(exist_ok=True)
     
-    output_file = output_dir / f"debate_{len(list(output_dir.glob('debate_*.json'))) + 1}.json"
-    with open(output_file, "w") as f:
-        json.dump({
-            "debate_topic": debate_topic,
-            "participants": {
-                "first_speaker": {
-                    "name": character_name1,
-                    "model": model1,
-                    "personality": system_prompt1
-                },
-                "second_speaker": {
-                    "name": character_name2,
-                    "model": model2,
-                    "personality": system_prompt2
-                }
+    # Timestamp keeps files in order; the random suffix avoids collisions without listing the directory
+    output_file = output_dir / f"debate_{time.strftime('%Y%m%d-%H%M%S')}_{uuid.uuid4().hex[:6]}.json"
+    payload = {
+        "debate_topic": debate_topic,
+        "participants": {
+            "first_speaker": {
+                "name": character_name1,
+                "model": model1,
+                "personality": system_prompt1
             },
-            "exchanges": turns,
-            "char_limit": max_chars,
-            "debate_log": history
-        }, f, indent=2)
+            "second_speaker": {
+                "name": character_name2,
+                "model": model2,
+                "personality": system_prompt2
+            }
+        },
+        "exchanges": turns,
+        "char_limit": max_chars,
+        "debate_log": [entry._asdict() for entry in history]
+    }
+    output_file.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
     
     print(f"\n=== Debate Saved ===")
     print(f"File: {output_file}")
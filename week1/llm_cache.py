@@ -0,0 +1,177 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import diskcache
+
+class LLMCache:
+    """Exact-match cache for LLM completions, persisted on disk."""
+
+    def __init__(self, directory: str = "~/.llm_cache", ttl: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            directory (str, optional): Directory for the on-disk cache. Defaults to ~/.llm_cache
+            ttl (int, optional): Seconds before an entry expires. None keeps entries until evicted
+        """
+        self._cache = diskcache.Cache(os.path.expanduser(directory))
+        self.ttl = ttl
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def cache_key(model: str, system_prompt: str, user_prompt: str, temperature: float) -> str:
+        """
+        Build the cache key for a completion request.
+
+        Returns:
+            str: SHA-256 hex digest of the request parameters
+        """
+        payload = json.dumps({
+            "model": model,
+            "system": system_prompt,
+            "user": user_prompt,
+            "temperature": temperature
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, model: str, system_prompt: str, user_prompt: str, temperature: float) -> Optional[str]:
+        """
+        Look up a cached completion.
+
+        Returns:
+            Optional[str]: The cached completion text, or None on a miss
+        """
+        text = self._cache.get(self.cache_key(model, system_prompt, user_prompt, temperature))
+        if text is None:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+        return text
+
+    def set(self, model: str, system_prompt: str, user_prompt: str, temperature: float, text: str) -> None:
+        """Store a completion in the cache."""
+        self._cache.set(self.cache_key(model, system_prompt, user_prompt, temperature), text, expire=self.ttl)
+
+class SemanticCache(LLMCache):
+    """
+    LLM cache that also matches semantically similar prompts.
+    
+    Exact matches are served from the on-disk cache. Otherwise the user prompt is embedded
+    and compared against previously cached prompts for the same model and system prompt;
+    a cosine similarity at or above the threshold counts as a hit. The embedding index
+    lives in memory for the lifetime of the process.
+    """
+
+    def __init__(self,
+                 directory: str = "~/.llm_cache",
+                 ttl: Optional[int] = None,
+                 threshold: float = 0.92,
+                 embedding_model: str = "all-MiniLM-L6-v2"):
+        """
+        Initialize the cache.
+
+        Args:
+            directory (str, optional): Directory for the on-disk exact cache. Defaults to ~/.llm_cache
+            ttl (int, optional): Seconds before an entry expires. None keeps entries until evicted
+            threshold (float, optional): Minimum cosine similarity for a semantic hit. Defaults to 0.92
+            embedding_model (str, optional): SentenceTransformer model used to embed prompts
+        """
+        # Imported here so the exact cache works without the embedding stack installed
+        import faiss
+        from sentence_transformers import SentenceTransformer
+
+        super().__init__(directory, ttl)
+        self.threshold = threshold
+        self._encoder = SentenceTransformer(embedding_model)
+        self._index = faiss.IndexFlatIP(self._encoder.get_sentence_embedding_dimension())
+        # (model, system_prompt, text, expires_at) for each vector in the index
+        self._entries: List[Tuple[str, str, str, Optional[float]]] = []
+        self.stats["semantic_hits"] = 0
+
+    def _embed(self, text: str):
+        return self._encoder.encode([text], normalize_embeddings=True).astype("float32")
+
+    def get(self, model: str, system_prompt: str, user_prompt: str, temperature: float) -> Optional[str]:
+        """
+        Look up a cached completion by exact key, then by prompt similarity.
+
+        Returns:
+            Optional[str]: The cached completion text, or None on a miss
+        """
+        text = self._cache.get(self.cache_key(model, system_prompt, user_prompt, temperature))
+        if text is not None:
+            self.stats["hits"] += 1
+            return text
+
+        if self._index.ntotal:
+            scores, ids = self._index.search(self._embed(user_prompt), min(5, self._index.ntotal))
+            now = time.time()
+            for score, i in zip(scores[0], ids[0]):
+                if score < self.threshold:
+                    break
+                entry_model, entry_system, text, expires_at = self._entries[i]
+                if (entry_model == model and entry_system == system_prompt
+                        and (expires_at is None or expires_at > now)):
+                    self.stats["semantic_hits"] += 1
+                    return text
+
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, model: str, system_prompt: str, user_prompt: str, temperature: float, text: str) -> None:
+        """Store a completion in both the exact cache and the similarity index."""
+        super().set(model, system_prompt, user_prompt, temperature, text)
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        self._index.add(self._embed(user_prompt))
+        self._entries.append((model, system_prompt, text, expires_at))
+
+_default_cache: Optional[LLMCache] = None
+
+def default_cache() -> LLMCache:
+    """Return the process-wide cache, creating it on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LLMCache()
+    return _default_cache
+
+def cached_completion(get_completion: Callable[..., str]) -> Callable[..., str]:
+    """
+    Decorate a client's get_completion so repeated requests are served from self.cache.
+
+    Requests with temperature > 0 always go to the provider to preserve sampling randomness.
+    Clients without a cache (self.cache is None) are not affected.
+    Works for both regular and async (aget_completion) methods.
+    """
+    if inspect.iscoroutinefunction(get_completion):
+        @functools.wraps(get_completion)
+        async def async_wrapper(self, system_prompt: str, user_prompt: str, model: str, temperature: float = 0.7) -> str:
+            cache = getattr(self, "cache", None)
+            if cache is None or temperature > 0:
+                return await get_completion(self, system_prompt, user_prompt, model, temperature)
+
+            text = cache.get(model, system_prompt, user_prompt, temperature)
+            if text is None:
+                text = await get_completion(self, system_prompt, user_prompt, model, temperature)
+                cache.set(model, system_prompt, user_prompt, temperature, text)
+            return text
+
+        return async_wrapper
+
+    @functools.wraps(get_completion)
+    def wrapper(self, system_prompt: str, user_prompt: str, model: str, temperature: float = 0.7) -> str:
+        cache = getattr(self, "cache", None)
+        if cache is None or temperature > 0:
+            return get_completion(self, system_prompt, user_prompt, model, temperature)
+
+        text = cache.get(model, system_prompt, user_prompt, temperature)
+        if text is None:
+            text = get_completion(self, system_prompt, user_prompt, model, temperature)
+            cache.set(model, system_prompt, user_prompt, temperature, text)
+        return text
+
+    return wrapper
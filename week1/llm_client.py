@@ -1,9 +1,107 @@
+import asyncio
+import importlib
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Callable, Coroutine, Tuple, TypeVar, Union
+from tenacity import retry, retry_if_exception, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+# Model lists change rarely, so they are cached on disk between runs
+MODELS_CACHE_DIR = Path.home() / ".llm_engineering"
+MODELS_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Client implementations by name as (module, class), imported only when requested
+CLIENT_TYPES = {
+    "openai": ("client_open_ai", "OpenAIClient"),
+    "ollama": ("client_ollama", "OllamaClient"),
+    "anthropic": ("client_anthropic", "AnthropicClient"),
+}
+
+def retry_transient(transient: Union[Tuple[type, ...], Callable[[BaseException], bool]]) -> Callable:
+    """
+    Decorate a provider call to retry transient failures with jittered exponential backoff.
+    
+    Waits 1s, 2s, 4s... (capped at 30s) between up to 5 attempts, then re-raises the last error.
+    Works for both regular and async functions.
+    
+    Args:
+        transient: Errors worth retrying, e.g. rate limits and dropped connections, as a tuple
+            of exception types or a predicate that takes the raised exception
+    """
+    return retry(
+        wait=wait_exponential_jitter(initial=1, max=30),
+        stop=stop_after_attempt(5),
+        retry=(retry_if_exception_type(transient) if isinstance(transient, tuple)
+               else retry_if_exception(transient)),
+        reraise=True
+    )
+
+T = TypeVar("T")
+
+def run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    Uses asyncio.run when no event loop is running. Inside a running loop (e.g. Jupyter or an
+    async web handler) asyncio.run raises RuntimeError, so the coroutine runs on its own loop in
+    a worker thread instead; async callers should await the async entry points directly.
+    
+    Args:
+        coroutine: The coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+def is_transient_status(status_code: int) -> bool:
+    """Whether an HTTP status means the same request may succeed if retried (timeouts, conflicts, rate limits, 5xx)."""
+    return status_code in (408, 409, 429) or status_code >= 500
 
 class LLMClient(ABC):
     """Base class for LLM clients."""
     
+    @classmethod
+    def create(cls, client_type: str) -> "LLMClient":
+        """
+        Create a client by name, importing only that provider's SDK.
+        
+        Args:
+            client_type (str): One of the names in CLIENT_TYPES
+            
+        Returns:
+            LLMClient: The initialized client
+            
+        Raises:
+            ValueError: If the client type is not supported
+        """
+        try:
+            module_name, class_name = CLIENT_TYPES[client_type.lower()]
+        except KeyError:
+            raise ValueError(f"Unsupported client type: {client_type}")
+        return getattr(importlib.import_module(module_name), class_name)()
+    
+    @classmethod
+    async def create_all(cls, client_types: List[str]) -> Dict[str, "LLMClient"]:
+        """
+        Create several clients concurrently so their connection checks overlap.
+        
+        Args:
+            client_types (List[str]): Names from CLIENT_TYPES
+            
+        Returns:
+            Dict[str, LLMClient]: The initialized clients keyed by client type
+        """
+        clients = await asyncio.gather(*(asyncio.to_thread(cls.create, client_type) for client_type in client_types))
+        return dict(zip(client_types, clients))
+    
     @abstractmethod
     def _validate_connection(self) -> None:
         """Validate connection/credentials to the LLM service."""
@@ -32,6 +130,109 @@ class LLMClient(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_chat(self,
+                 system_prompt: str,
+                 messages: List[Dict[str, str]],
+                 model: str,
+                 temperature: float = 0.7) -> str:
+        """
+        Get the next assistant message for a multi-turn chat.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            messages (List[Dict[str, str]]): Prior turns as {"role": "user" | "assistant", "content": ...}
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Returns:
+            str: The generated message text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        pass
+
+    async def aget_chat(self,
+                        system_prompt: str,
+                        messages: List[Dict[str, str]],
+                        model: str,
+                        temperature: float = 0.7) -> str:
+        """
+        Get the next assistant message for a multi-turn chat without blocking the event loop.
+        
+        The default implementation runs get_chat in a worker thread;
+        clients with an async SDK override this.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            messages (List[Dict[str, str]]): Prior turns as {"role": "user" | "assistant", "content": ...}
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Returns:
+            str: The generated message text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        return await asyncio.to_thread(self.get_chat, system_prompt, messages, model, temperature)
+
+    async def aget_completion(self,
+                              system_prompt: str,
+                              user_prompt: str,
+                              model: str,
+                              temperature: float = 0.7) -> str:
+        """
+        Get completion from LLM API without blocking the event loop.
+        
+        The default implementation runs get_completion in a worker thread;
+        clients with an async SDK override this.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            user_prompt (str): The user prompt for completion
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Returns:
+            str: The generated completion text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        return await asyncio.to_thread(self.get_completion, system_prompt, user_prompt, model, temperature)
+
+    async def aclose(self) -> None:
+        """
+        Release resources bound to the running event loop.
+        
+        Call before the loop ends; the default implementation holds none.
+        """
+
+    @abstractmethod
+    def get_completion_stream(self,
+                              system_prompt: str,
+                              user_prompt: str,
+                              model: str,
+                              temperature: float = 0.7) -> Iterator[str]:
+        """
+        Stream a completion from LLM API as it is generated.
+        
+        Args:
+            system_prompt (str): The system prompt to set context
+            user_prompt (str): The user prompt for completion
+            model (str): Model to use
+            temperature (float, optional): Sampling temperature. Defaults to 0.7
+            
+        Yields:
+            str: Successive chunks of the generated completion text
+            
+        Raises:
+            Exception: If there's an error in API communication
+        """
+        pass
+
     @abstractmethod
     def list_models(self) -> List[str]:
         """
@@ -43,4 +244,27 @@ class LLMClient(ABC):
         Raises:
             Exception: If there's an error in API communication
         """
-        pass 
\ No newline at end of file
+        pass
+
+    def _cached_models(self, provider: str, fetch: Callable[[], List[str]]) -> List[str]:
+        """
+        Return the provider's model list from the disk cache, fetching it if missing or stale.
+        
+        Args:
+            provider (str): Provider name used for the cache file
+            fetch (Callable[[], List[str]]): Function that fetches the model list from the API
+            
+        Returns:
+            List[str]: List of model identifiers available for use
+        """
+        cache_path = MODELS_CACHE_DIR / f"models_{provider}.json"
+        try:
+            if time.time() - cache_path.stat().st_mtime < MODELS_CACHE_TTL:
+                return json.loads(cache_path.read_text())
+        except (OSError, ValueError):
+            pass
+        
+        models = fetch()
+        MODELS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(models))
+        return models
\ No newline at end of file
@@ -1,15 +1,55 @@
+import os
+import re
+import asyncio
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import urlparse, urljoin
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Runs of any whitespace, collapsed to a single space in extracted text
+_WS_RE = re.compile(r'\s+')
+
+# Elements whose text is not part of the readable page content
+_SKIP_TAGS = ('script', 'style', 'header', 'footer', 'nav')
+
+# Bytes read from the response per parser feed
+_CHUNK_SIZE = 64 * 1024
+
+# URL prefixes checked for every URL and link
+_SCHEMES = ('http://', 'https://')
+_SKIP_PREFIXES = ('javascript:', 'mailto:', '#')
+
+# HTTP cache honouring Cache-Control/ETag headers, so repeat fetches of a page
+# are served locally or revalidated with a conditional GET. Only Website(url) uses it;
+# fetch_all goes through aiohttp and always hits the network
+_SESSION = requests_cache.CachedSession(
+    os.path.expanduser("~/.website_cache"),
+    expire_after=3600,
+    stale_if_error=True,
+    cache_control=True
+)
+# Keep connections open for reuse across pages and retry transient failures
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+# Below this many pages, parsing inline is cheaper than shipping HTML to worker processes
+_PARSE_POOL_MIN_PAGES = 4
+_parse_pool: Optional[ProcessPoolExecutor] = None
 
 class Website:
-    def __init__(self, url: str):
+    def __init__(self, url: str, max_chars: int = None):
         """
         Initialize Website with URL and fetch its content.
         
         Args:
             url (str): The URL to fetch
+            max_chars (int, optional): Stop extracting text after this many characters
             
         Raises:
             ValueError: If URL is invalid
@@ -17,18 +57,22 @@ class Website:
             Exception: For other errors during fetching
         """
         # Ensure URL has proper scheme
-        if not url.startswith(('http://', 'https://')):
+        if not url.startswith(_SCHEMES):
             url = 'https://' + url
             
         try:
-            response = requests.get(url, timeout=10)  # Add timeout
+            response = _SESSION.get(url, timeout=10, stream=True)  # Add timeout
             response.raise_for_status()  # Raise error for bad status codes
             
-            self.url = url
-            soup = BeautifulSoup(response.text, 'html.parser')
-            self.title = soup.title.string if soup.title else "No title found"
-            self.text = self._extract_text(soup)
-            self.links = self._extract_links(soup)
+            # Feed the body to the parser in chunks. Only responses the cache does not store
+            # (no-store, max-age=0) actually stream from the network; for stored responses
+            # and cache hits, requests_cache has already read the whole body into memory
+            with response:
+                parser = _html_parser(_header_encoding(response))
+                for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                    parser.feed(chunk)
+                # Use the address after redirects, so relative links and same-site checks match it
+                self._parse_root(response.url, _close_parser(parser), max_chars)
             
         except requests.exceptions.MissingSchema:
             raise ValueError(f"Invalid URL format: {url}")
@@ -39,6 +83,80 @@ class Website:
         except requests.exceptions.RequestException as e:
             raise Exception(f"Error fetching website content: {str(e)}")
     
+    @classmethod
+    def from_html(cls,
+                  url: str,
+                  html: Union[str, bytes],
+                  max_chars: int = None,
+                  encoding: str = None) -> "Website":
+        """
+        Build a Website from already-fetched HTML without any network access.
+        
+        Args:
+            url (str): The URL the HTML was fetched from
+            html (Union[str, bytes]): The raw HTML content; pass bytes to let the parser detect the encoding
+            max_chars (int, optional): Stop extracting text after this many characters
+            encoding (str, optional): Charset from the response headers, used to decode bytes
+            
+        Returns:
+            Website: The parsed website
+        """
+        website = cls.__new__(cls)
+        parser = _html_parser(encoding if isinstance(html, bytes) else None)
+        parser.feed(html)
+        website._parse_root(url, _close_parser(parser), max_chars)
+        return website
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Website":
+        """
+        Rebuild a Website from the output of to_dict, e.g. after parsing in another process.
+        
+        Args:
+            data (Dict[str, Any]): Dictionary with url, title, text and links
+            
+        Returns:
+            Website: The rebuilt website
+        """
+        website = cls.__new__(cls)
+        website.url = data["url"]
+        website.title = data["title"]
+        website.text = data["text"]
+        website.links = data["links"]
+        return website
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the parsed content as plain, picklable types.
+        
+        Returns:
+            Dict[str, Any]: Dictionary with url, title, text and links
+        """
+        return {
+            "url": self.url,
+            "title": None if self.title is None else str(self.title),
+            "text": self.text,
+            "links": self.links
+        }
+    
+    def _parse_root(self, url: str, root: Optional[etree._Element], max_chars: int = None) -> None:
+        """
+        Extract title, text and links from a parsed HTML tree.
+        
+        Args:
+            url (str): The URL the HTML was fetched from
+            root (etree._Element, optional): Root of the parsed document, None for an empty page
+            max_chars (int, optional): Stop extracting text after this many characters
+        """
+        self.url = url
+        if root is None:
+            self.title, self.text, self.links = "No title found", "", []
+            return
+        title = root.find('.//title')
+        self.title = title.text if title is not None else "No title found"
+        self.text = self._extract_text(root, max_chars)
+        self.links = self._extract_links(root)
+    
     def _normalize_url(self, url: str) -> str:
         """
         Normalize the URL by ensuring it has a proper scheme and format.
@@ -58,7 +176,7 @@ class Website:
         url = url.strip()
         
         # Add https if no scheme is present
-        if not url.startswith(('http://', 'https://')):
+        if not url.startswith(_SCHEMES):
             url = 'https://' + url
         
         # Parse the URL to validate its format
@@ -68,84 +186,168 @@ class Website:
             
         return url
     
-    def _fetch_and_parse(self):
-        try:
-            # Send GET request to the URL
-            response = requests.get(self.url)
-            response.raise_for_status()
-            
-            # Create BeautifulSoup object
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract title
-            title_tag = soup.find('title')
-            self.title = title_tag.text.strip() if title_tag else ""
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'head', 'header', 'footer', 'nav']):
-                element.decompose()
-            
-            # Get text content and clean it
-            text = soup.get_text()
+    def _extract_text(self, root: etree._Element, max_chars: int = None) -> str:
+        """
+        Extract readable text from a parsed HTML tree.
+        
+        Args:
+            root (etree._Element): Root of the parsed document
+            max_chars (int, optional): Stop extracting after this many characters
             
-            # Clean up the text: remove extra whitespace and empty lines
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            self.text = ' '.join(chunk for chunk in chunks if chunk)
+        Returns:
+            str: Extracted text content
+        """
+        # Remove script and style elements, and comments, keeping the text that follows them
+        etree.strip_elements(root, etree.Comment, *_SKIP_TAGS, with_tail=False)
+        
+        if max_chars is not None:
+            return self._extract_text_prefix(root, max_chars)
             
-        except requests.RequestException as e:
-            raise Exception(f"Error fetching website content: {str(e)}")
+        # Join all text in one pass, then collapse whitespace runs left inside strings
+        return _WS_RE.sub(' ', ' '.join(_stripped_strings(root)))
 
-    def _extract_text(self, soup: BeautifulSoup) -> str:
+    def _extract_text_prefix(self, root: etree._Element, max_chars: int) -> str:
         """
-        Extract readable text from BeautifulSoup object.
+        Extract at most max_chars of readable text, walking only as much of the page as needed.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML content
+            root (etree._Element): Root of the parsed document with unwanted elements removed
+            max_chars (int): Maximum number of characters to return
             
         Returns:
             str: Extracted text content
         """
-        # Remove script and style elements
-        for element in soup(['script', 'style', 'header', 'footer', 'nav']):
-            element.decompose()
-            
-        # Get text and clean it up
-        text = soup.get_text()
-        # Break into lines and remove leading/trailing space
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        return text 
+        chunks = []
+        length = 0
+        for string in _stripped_strings(root):
+            chunk = _WS_RE.sub(' ', string)
+            chunks.append(chunk)
+            length += len(chunk) + 1
+            if length > max_chars:
+                break
+        return ' '.join(chunks)[:max_chars]
 
-    def _extract_links(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_links(self, root: etree._Element) -> List[str]:
         """
         Extract all hyperlinks from the webpage.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML content
+            root (etree._Element): Root of the parsed document
             
         Returns:
             List[str]: List of absolute URLs found in the page
         """
         links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
+        seen = set()
+        for link in root.iterfind('.//a[@href]'):
+            href = link.get('href')
             
             # Skip javascript and mailto links
-            if href.startswith(('javascript:', 'mailto:', '#')):
+            if href.startswith(_SKIP_PREFIXES):
                 continue
             
             # Convert to absolute URL if relative
             absolute_url = urljoin(self.url, href)
             
             # Remove fragments
-            absolute_url = absolute_url.split('#')[0]
+            absolute_url = absolute_url.partition('#')[0]
             
-            if absolute_url not in links:  # Avoid duplicates
-                links.append(absolute_url)
+            if absolute_url in seen:  # Avoid duplicates
+                continue
+            seen.add(absolute_url)
+            links.append(absolute_url)
                 
-        return links 
\ No newline at end of file
+        return links
+
+async def fetch_all(urls: List[str],
+                    max_chars: int = None,
+                    max_connections: int = 32,
+                    max_per_host: int = 8) -> List[Website]:
+    """
+    Fetch and parse several URLs concurrently.
+    
+    Pages are always fetched from the network; unlike Website(url), they bypass the HTTP cache.
+    
+    Args:
+        urls (List[str]): The URLs to fetch
+        max_chars (int, optional): Stop extracting text after this many characters per page
+        max_connections (int, optional): Maximum requests in flight. Defaults to 32
+        max_per_host (int, optional): Maximum requests in flight per host. Defaults to 8
+        
+    Returns:
+        List[Website]: Parsed websites in the order of urls; pages that fail to load or parse are skipped
+    """
+    timeout = aiohttp.ClientTimeout(total=10)
+    
+    async def fetch(session: aiohttp.ClientSession, url: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                # Keep the header charset so pages decode as they do in Website(url)
+                return await response.read(), response.charset
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+    
+    connector = aiohttp.TCPConnector(limit=max_connections, limit_per_host=max_per_host)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        pages = await asyncio.gather(*(fetch(session, url) for url in urls))
+    
+    fetched = [(url, *page) for url, page in zip(urls, pages) if page is not None]
+    
+    # Parsing is CPU-bound, so spread larger batches across processes
+    if len(fetched) >= _PARSE_POOL_MIN_PAGES:
+        loop = asyncio.get_running_loop()
+        pool = _get_parse_pool()
+        parsed = await asyncio.gather(
+            *(loop.run_in_executor(pool, _parse_page, url, html, max_chars, encoding)
+              for url, html, encoding in fetched),
+            return_exceptions=True
+        )
+        return [Website.from_dict(data) for data in parsed if not isinstance(data, BaseException)]
+    
+    websites = []
+    for url, html, encoding in fetched:
+        try:
+            websites.append(Website.from_html(url, html, max_chars, encoding))
+        except Exception:
+            continue
+    return websites
+
+def _html_parser(encoding: str = None) -> etree.HTMLParser:
+    """Create a forgiving incremental HTML parser; without an encoding it is detected from the page."""
+    try:
+        return etree.HTMLParser(encoding=encoding, recover=True)
+    except LookupError:
+        # Servers send bogus charsets (e.g. "none", "binary"); fall back to detection
+        return etree.HTMLParser(recover=True)
+
+def _close_parser(parser: etree.HTMLParser) -> Optional[etree._Element]:
+    """Finish parsing and return the document root, or None if the page had no content."""
+    try:
+        return parser.close()
+    except etree.XMLSyntaxError:
+        return None
+
+def _header_encoding(response: requests.Response) -> Optional[str]:
+    """Return the charset declared in the Content-Type header, if any."""
+    if 'charset' not in response.headers.get('content-type', '').lower():
+        return None
+    return requests.utils.get_encoding_from_headers(response.headers)
+
+def _stripped_strings(root: etree._Element) -> Iterator[str]:
+    """Yield each non-empty text node of the tree with surrounding whitespace removed."""
+    for string in root.itertext():
+        string = string.strip()
+        if string:
+            yield string
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Return the process pool used for parsing, creating it on first use."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _parse_pool
+
+def _parse_page(url: str, html: bytes, max_chars: int = None, encoding: str = None) -> Dict[str, Any]:
+    """Parse a page in a worker process and return it in picklable form."""
+    return Website.from_html(url, html, max_chars, encoding).to_dict()